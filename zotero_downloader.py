@@ -5,14 +5,220 @@ Downloads documents from Zotero library that were added in the past DAYS_BACK da
 
 import os
 from dotenv import load_dotenv
+import queue
 import sys
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import json
+import logging
+import logging.handlers
+import mimetypes
+import random
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Any
-from pyzotero import zotero
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, Set, Tuple, TypeVar
+from urllib.parse import urlencode
+import aiofiles
+import aiohttp
+from tqdm import tqdm
+
+ZOTERO_API_URL = "https://api.zotero.org"
+
+# Number of attachment downloads allowed to run at the same time
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Number of metadata requests allowed to run at the same time (Zotero rate limits)
+MAX_CONCURRENT_REQUESTS = 5
+
+# Seconds an idle connection is kept open for reuse by later requests
+KEEPALIVE_TIMEOUT = 60
+
+# Seconds a resolved host address is reused before looking it up again
+DNS_CACHE_TTL = 300
+
+# No limit on the total request time, so large files can stream for as long as
+# data keeps arriving; only stalled connections time out
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+
+# Number of attempts made for each request before giving up
+MAX_ATTEMPTS = 5
+
+# Response statuses worth retrying (rate limited or temporary server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Size of the chunks files are streamed to disk in
+CHUNK_SIZE = 65536
+
+# Maximum number of items the Zotero API returns per request
+ITEMS_PAGE_SIZE = 100
+
+# Maximum number of listed items waiting for their attachments to be looked up
+ITEMS_QUEUE_SIZE = 100
+
+# Replaces invalid chars for most filesystems (< > : " | ? * \ /) with underscores
+_INVALID_CHARS_TABLE = str.maketrans({c: '_' for c in '<>:"|?*\\/'})
+
+# Runs of spaces and underscores
+_MULTI_SEP = re.compile(r'[_\s]+')
+
+# File extensions of common attachment content types (mimetypes picks odd ones for some)
+_EXT_MAP = {
+    'application/pdf': '.pdf',
+    'text/html': '.html',
+    'application/xhtml+xml': '.html',
+    'application/epub+zip': '.epub',
+    'application/msword': '.doc',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'text/plain': '.txt',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+}
+
+# Location of the cache for Zotero API responses
+CACHE_PATH = Path.home() / ".cache" / "zotero_downloader" / "meta.sqlite"
+
+class MetadataCache:
+    def __init__(self, path: Path):
+        """
+        Initialize the on-disk cache of Zotero API responses.
+        
+        Args:
+            path: Path of the SQLite database file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, version INT, json BLOB)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INT, mtime REAL, md5 TEXT)"
+        )
+    
+    def get(self, key: str) -> Optional[Tuple[int, Any]]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key of the response
+            
+        Returns:
+            Tuple of (library version, response), or None if not cached
+        """
+        row = self.connection.execute(
+            "SELECT version, json FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+    
+    def put(self, key: str, version: int, value: Any) -> None:
+        """
+        Store a response in the cache, replacing any previous one.
+        
+        Args:
+            key: Cache key of the response
+            version: Library version the response was fetched at
+            value: JSON-serializable response
+        """
+        self.connection.execute(
+            "INSERT INTO meta (key, version, json) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET version = excluded.version, json = excluded.json",
+            (key, version, json.dumps(value))
+        )
+    
+    def get_file_md5(self, path: str, size: int, mtime: float) -> Optional[str]:
+        """
+        Look up the MD5 hash of a local file.
+        
+        Args:
+            path: Absolute path of the file
+            size: Current size of the file
+            mtime: Current modification time of the file
+            
+        Returns:
+            MD5 hex digest, or None if the file is not cached or has changed
+        """
+        row = self.connection.execute(
+            "SELECT md5 FROM files WHERE path = ? AND size = ? AND mtime = ?", (path, size, mtime)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def put_file_md5(self, path: str, size: int, mtime: float, md5: str) -> None:
+        """
+        Store the MD5 hash of a local file.
+        
+        Args:
+            path: Absolute path of the file
+            size: Size of the file when it was hashed
+            mtime: Modification time of the file when it was hashed
+            md5: MD5 hex digest of the file
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime, md5) VALUES (?, ?, ?, ?)",
+            (path, size, mtime, md5)
+        )
+    
+    def save(self) -> None:
+        """
+        Write pending changes to disk.
+        """
+        self.connection.commit()
+
+
+T = TypeVar('T')
+
+log = logging.getLogger(__name__)
+
+
+class TqdmHandler(logging.StreamHandler):
+    """
+    Logging handler that writes around the download progress bar.
+    """
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            tqdm.write(self.format(record), file=self.stream)
+        except Exception:
+            self.handleError(record)
+
+
+@contextmanager
+def queued_logging() -> Iterator[None]:
+    """
+    Print log messages to stdout while the context is active, unless logging
+    is already configured by the caller.
+    
+    Messages go through a queue to a single handler on a background thread,
+    so concurrent downloads don't block on writing to stdout.
+    """
+    if log.hasHandlers():
+        yield
+        return
+    
+    log_queue = queue.SimpleQueue()
+    handler = TqdmHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    
+    log.addHandler(queue_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        log.removeHandler(queue_handler)
+        log.setLevel(logging.NOTSET)
+        log.propagate = True
+
 
 class ZoteroDownloader:
-    def __init__(self, user_id: str, api_key: str, library_type: str = 'user'):
+    def __init__(self, user_id: str, api_key: str, library_type: str = 'user',
+                 cache_path: Path = CACHE_PATH):
         """
         Initialize Zotero downloader.
         
@@ -20,84 +226,281 @@ class ZoteroDownloader:
             user_id: Your Zotero user ID
             api_key: Your Zotero API key
             library_type: 'user' or 'group' (default: 'user')
+            cache_path: Path of the API response cache
         """
-        self.zot = zotero.Zotero(user_id, library_type, api_key)
         self.user_id = user_id
+        self.api_key = api_key
+        self.library_url = f"{ZOTERO_API_URL}/{library_type}s/{user_id}"
+        self.cache = MetadataCache(cache_path)
+        # Latest library version seen during this run
+        self.library_version = None
+        # Names of the files in each download directory by their casefolded name,
+        # including names handed out to downloads that may not be on disk yet
+        self._dir_entries = {}
         
-    def get_recent_items(self, days: int) -> List[Dict[str, Any]]:
+    async def _get_json(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                        url: str, params: Dict[str, Any]) -> Tuple[Any, int]:
         """
-        Get items added to library in the past n days.
+        Get a JSON response from the Zotero API, using the cache when possible.
+        
+        Cached responses are reused without a request if the library has not
+        changed during this run. Otherwise they are revalidated with the
+        If-Modified-Since-Version header, so unchanged responses are not sent again.
         
         Args:
-            days: Number of days to look back
+            session: HTTP session used for the request
+            semaphore: Semaphore limiting the number of concurrent requests
+            url: URL of the request
+            params: Query parameters of the request
             
         Returns:
-            List of Zotero items
+            Tuple of (response JSON, value of the Total-Results header)
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}"
+        cached = self.cache.get(cache_key)
+        headers = {}
+        if cached is not None:
+            cached_version, cached_response = cached
+            if cached_version == self.library_version:
+                return cached_response['data'], cached_response['total_results']
+            headers['If-Modified-Since-Version'] = str(cached_version)
         
-        # Keep parent items only (limited to recent ones by API if possible)
-        # Note: Zotero API doesn't have a direct date filter, so we fetch and filter
-        try:
-            items = self.zot.items(limit=100, sort='dateAdded', direction='desc')
+        async def fetch() -> Tuple[int, Any, int, Optional[str]]:
+            async with semaphore:
+                async with session.get(url, params=params, headers=headers) as response:
+                    if response.status == 304:
+                        return 304, None, 0, response.headers.get('Last-Modified-Version')
+                    response.raise_for_status()
+                    return (response.status, await response.json(), int(response.headers.get('Total-Results', 0)),
+                            response.headers.get('Last-Modified-Version'))
+        
+        status, data, total_results, version_header = await self._retry(fetch)
+        
+        if status == 304:
+            version = int(version_header or cached_version)
+            self.library_version = max(self.library_version or 0, version)
+            self.cache.put(cache_key, version, cached_response)
+            return cached_response['data'], cached_response['total_results']
+        
+        version = int(version_header or 0)
+        self.library_version = max(self.library_version or 0, version)
+        self.cache.put(cache_key, version, {'data': data, 'total_results': total_results})
+        return data, total_results
+    
+    async def _retry(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a request, retrying with exponential backoff on transient errors.
+        
+        Rate limited (429) and temporary server errors are retried, waiting for
+        as long as the Retry-After header asks if it is given.
+        
+        Args:
+            request: Function starting the request
             
-        except Exception as e:
-            print(f"Error fetching items: {e}")
-            return []
+        Returns:
+            Result of the request
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                return await request()
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES or attempt == MAX_ATTEMPTS - 1:
+                    raise
+                retry_after = e.headers.get('Retry-After') if e.headers else None
+                if retry_after and retry_after.isdigit():
+                    delay = int(retry_after)
+                else:
+                    delay = 2 ** attempt * 0.5 + random.random() * 0.1
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                delay = 2 ** attempt * 0.5 + random.random() * 0.1
+            
+            await asyncio.sleep(delay)
+    
+    async def _fetch_items_page(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                start: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get one page of library items, newest first.
         
-        recent_items = []
-        seen_keys = []
+        Args:
+            session: HTTP session used for the request
+            semaphore: Semaphore limiting the number of concurrent requests
+            start: Index of the first item of the page
+            
+        Returns:
+            Tuple of (items on the page, total number of items in the library)
+        """
+        params = {
+            'sort': 'dateAdded',
+            'direction': 'desc',
+            # Annotations are children of attachments and would bloat the listing
+            'itemType': '-annotation',
+            'include': 'data',
+            'limit': ITEMS_PAGE_SIZE,
+            'start': start,
+        }
+        return await self._get_json(session, semaphore, f"{self.library_url}/items", params)
+    
+    async def get_recent_items(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, days: int,
+                               children: Dict[str, List[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Get items added to library in the past n days, as each page of the listing arrives.
+        
+        Child items (attachments and notes) added in the same period come with
+        the same listing, so they are added to children, grouped by parent key.
+        A child is listed before its parent, since it was added after it.
+        
+        Args:
+            session: HTTP session used for the requests
+            semaphore: Semaphore limiting the number of concurrent requests
+            days: Number of days to look back
+            children: Dict the child items are added to
+            
+        Yields:
+            Parent items, newest first
+            
+        Raises:
+            aiohttp.ClientError: If a page of the listing cannot be fetched
+        """
+        # dateAdded is an ISO 8601 UTC string, which sorts like the date itself
+        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        
+        # Note: Zotero API doesn't have a direct date filter, so we page through
+        # the items newest first until the cutoff date is reached
+        seen_keys = set()
+        start = 0
+        total_results = None
+        while total_results is None or start < total_results:
+            if total_results is None:
+                # The first page tells how many items there are in total
+                starts = [0]
+            else:
+                # Fetch the next few pages concurrently
+                end = min(total_results, start + ITEMS_PAGE_SIZE * MAX_CONCURRENT_REQUESTS)
+                starts = list(range(start, end, ITEMS_PAGE_SIZE))
+            
+            pages = [
+                asyncio.ensure_future(self._fetch_items_page(session, semaphore, page_start))
+                for page_start in starts
+            ]
+            try:
+                for page in pages:
+                    # A failed page raises, since the items after it would be missing
+                    items, total_results = await page
+                    
+                    page_items = []
+                    more = self._collect_recent_items(items, cutoff_date, page_items, children, seen_keys)
+                    for item in page_items:
+                        yield item
+                    if not more:
+                        return
+            finally:
+                # Pages past the cutoff date are not needed
+                for page in pages:
+                    page.cancel()
+                # Collect their results so failed pages don't log unretrieved exceptions
+                await asyncio.gather(*pages, return_exceptions=True)
+            
+            start = starts[-1] + ITEMS_PAGE_SIZE
+    
+    def _collect_recent_items(self, items: List[Dict[str, Any]], cutoff_date: str,
+                              recent_items: List[Dict[str, Any]], children: Dict[str, List[Dict[str, Any]]],
+                              seen_keys: Set[str]) -> bool:
+        """
+        Add the items added after the cutoff date to recent_items (parent items)
+        and children (child items).
+        
+        Args:
+            items: Items sorted by dateAdded, newest first
+            cutoff_date: Oldest date of interest, formatted like dateAdded
+            recent_items: List the recent parent items are appended to
+            children: Dict the recent child items are added to, by parent key
+            seen_keys: Keys of the items already collected
+            
+        Returns:
+            False once an item older than the cutoff date is found, True otherwise
+        """
         for item in items:      
-            # Parse the dateAdded field
+            # Zotero uses ISO 8601 format: 2024-01-15T10:30:00Z
             date_added_str = item['data'].get('dateAdded', '')
             if date_added_str:
-                try:
-                    # Zotero uses ISO 8601 format: 2024-01-15T10:30:00Z
-                    date_added = datetime.fromisoformat(date_added_str.replace('Z', '+00:00'))
-                    # Convert to local time for comparison (removing timezone info)
-                    date_added = date_added.replace(tzinfo=None)
-                    
-                    if date_added >= cutoff_date: 
-                        # These are the items of interest. Only add parent items.
-                        if 'parentItem' not in item['data']:
-                            item_key = item['key']
-                            if item_key not in seen_keys:
-                                seen_keys.append(item_key)
-                                recent_items.append(item)
+                if date_added_str >= cutoff_date: 
+                    # These are the items of interest. Keep children apart from parent items.
+                    item_key = item['key']
+                    if item_key not in seen_keys:
+                        seen_keys.add(item_key)
+                        parent_key = item['data'].get('parentItem')
+                        if parent_key:
+                            children.setdefault(parent_key, []).append(item)
+                        else:
+                            recent_items.append(item)
 
-                    else:
-                        # Since items are sorted by dateAdded desc, we can break early
-                        break
-                except ValueError:
-                    print(f"Could not parse date: {date_added_str}")
-                    continue
+                else:
+                    # Since items are sorted by dateAdded desc, we can stop early
+                    return False
         
-        return recent_items
+        return True
     
-    def get_item_attachments(self, item_key: str) -> List[Dict[str, Any]]:
+    async def _fetch_children(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                              item_key: str) -> List[Dict[str, Any]]:
         """
         Get attachments for a specific item.
         
         Args:
+            session: HTTP session used for the request
+            semaphore: Semaphore limiting the number of concurrent requests
             item_key: The key of the parent item
             
         Returns:
             List of attachment items
         """
         try:
-            attachments = self.zot.children(item_key)
-
-            # Filter for file attachments only
-            file_attachments = [
-                att for att in attachments 
-                if att['data'].get('itemType') == 'attachment' and 
-                att['data'].get('linkMode') in ['imported_file', 'imported_url']
-            ]
-            return file_attachments
+            url = f"{self.library_url}/items/{item_key}/children"
+            attachments, _ = await self._get_json(session, semaphore, url, {'limit': 100})
+            return self._filter_file_attachments(attachments)
         except Exception as e:
-            print(f"Error getting attachments for item {item_key}: {e}")
+            log.error("Error getting attachments for item %s: %s", item_key, e)
             return []
     
+    async def get_item_attachments(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                   item: Dict[str, Any], children: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Get attachments for a specific item, requesting them only if the listing did not include all of them.
+        
+        Args:
+            session: HTTP session used for the request
+            semaphore: Semaphore limiting the number of concurrent requests
+            item: The parent item
+            children: Child items from the listing, by parent key
+            
+        Returns:
+            List of attachment items
+        """
+        listed_children = children.get(item['key'], [])
+        num_children = item.get('meta', {}).get('numChildren')
+        if num_children is not None and len(listed_children) >= num_children:
+            return self._filter_file_attachments(listed_children)
+        
+        # Some children were added before the cutoff date
+        return await self._fetch_children(session, semaphore, item['key'])
+    
+    def _filter_file_attachments(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filter for file attachments only.
+        
+        Args:
+            items: Child items
+            
+        Returns:
+            List of attachment items with a stored file
+        """
+        return [
+            att for att in items 
+            if att['data'].get('itemType') == 'attachment' and 
+            att['data'].get('linkMode') in ['imported_file', 'imported_url']
+        ]
+    
     def sanitize_filename(self, filename: str) -> str:
         """
         Sanitize filename by removing/replacing invalid characters.
@@ -108,15 +511,11 @@ class ZoteroDownloader:
         Returns:
             Sanitized filename safe for filesystem
         """
-        import re
-        
         # Remove or replace invalid characters for most filesystems
-        # Invalid chars: < > : " | ? * \ /
-        invalid_chars = r'[<>:"|?*\\/]'
-        filename = re.sub(invalid_chars, '_', filename)
+        filename = filename.translate(_INVALID_CHARS_TABLE)
         
         # Remove multiple consecutive spaces and underscores
-        filename = re.sub(r'[_\s]+', '_', filename)
+        filename = _MULTI_SEP.sub('_', filename)
         
         # Remove leading/trailing spaces and dots
         filename = filename.strip(' .')
@@ -134,7 +533,7 @@ class ZoteroDownloader:
     
     def get_file_extension(self, attachment) -> str:
         """
-        Extract file extension from original attachment.
+        Extract file extension from the content type of the original attachment.
         
         Args:
             attachment: Original attachment
@@ -142,15 +541,9 @@ class ZoteroDownloader:
         Returns:
             File extension including the dot (e.g., '.pdf')
         """
-        content_type = attachment['data'].get('contentType')
+        content_type = (attachment['data'].get('contentType') or '').split(';')[0].strip().lower()
         
-        # Content is pdf or URL.
-        if "pdf" in content_type:
-            ext = ".pdf"
-        else:
-            ext = ".html"
-
-        return ext
+        return _EXT_MAP.get(content_type) or mimetypes.guess_extension(content_type) or '.bin'
     
     def generate_unique_filename(self, base_name: str, extension: str, download_dir: str) -> str:
         """
@@ -164,30 +557,183 @@ class ZoteroDownloader:
         Returns:
             Unique filename
         """
+        existing = self._get_dir_entries(download_dir)
         filename = base_name + extension
-        file_path = os.path.join(download_dir, filename)
         
-        if not os.path.exists(file_path):
-            return filename
-        
-        # File exists, add counter
-        counter = 1
-        while True:
+        # File exists, add counter (names are compared ignoring case, since
+        # Windows and macOS filesystems would treat them as the same file)
+        counter = 0
+        while filename.casefold() in existing:
+            counter += 1
             filename = f"{base_name}_{counter}{extension}"
-            file_path = os.path.join(download_dir, filename)
-            if not os.path.exists(file_path):
-                return filename
+        
+        existing[filename.casefold()] = filename
+        return filename
+    
+    def _get_dir_entries(self, download_dir: str) -> Dict[str, str]:
+        """
+        Get the names of the files in a directory, scanning it only on first use.
+        
+        Args:
+            download_dir: Target directory
+            
+        Returns:
+            Dict of filenames by casefolded filename, updated by generate_unique_filename
+        """
+        key = os.path.abspath(download_dir)
+        if key not in self._dir_entries:
+            try:
+                with os.scandir(download_dir) as entries:
+                    self._dir_entries[key] = {entry.name.casefold(): entry.name for entry in entries}
+            except FileNotFoundError:
+                self._dir_entries[key] = {}
+        return self._dir_entries[key]
+    
+    def get_local_md5(self, file_path: str) -> str:
+        """
+        Compute the MD5 hash of a local file, reusing the cached hash if the file is unchanged.
+        
+        Args:
+            file_path: Path of the file
+            
+        Returns:
+            MD5 hex digest of the file
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        md5 = self.cache.get_file_md5(file_path, stat.st_size, stat.st_mtime)
+        if md5 is None:
+            digest = hashlib.md5()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            md5 = digest.hexdigest()
+            self.cache.put_file_md5(file_path, stat.st_size, stat.st_mtime, md5)
+        return md5
+    
+    def find_existing_download(self, base_name: str, extension: str, download_dir: str,
+                               md5: Optional[str]) -> Optional[str]:
+        """
+        Find a file previously downloaded under the given name with the given content.
+        
+        Args:
+            base_name: Base filename without extension
+            extension: File extension
+            download_dir: Target directory
+            md5: MD5 hash of the attachment file reported by Zotero
+            
+        Returns:
+            Filename of the matching file, or None if there is none
+        """
+        if not md5:
+            return None
+        
+        # Check the same names generate_unique_filename hands out
+        existing = self._get_dir_entries(download_dir)
+        filename = base_name + extension
+        counter = 0
+        while filename.casefold() in existing:
+            existing_filename = existing[filename.casefold()]
+            file_path = os.path.join(download_dir, existing_filename)
+            # Names handed out during this run may not be on disk yet
+            if os.path.isfile(file_path) and self.get_local_md5(file_path) == md5:
+                return existing_filename
             counter += 1
+            filename = f"{base_name}_{counter}{extension}"
+        
+        return None
     
-    def download_attachment(self, attachment: Dict[str, Any], parent_item: Dict[str, Any], download_dir: str) -> bool:
+    def get_file_url(self, attachment_key: str) -> str:
         """
-        Download a single attachment file with custom naming.
+        Build the Zotero API URL of an attachment file.
+        
+        Args:
+            attachment_key: The key of the attachment item
+            
+        Returns:
+            URL of the attachment file
+        """
+        return f"{self.library_url}/items/{attachment_key}/file"
+    
+    async def _stream_to_file(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                              url: str, file_path: str) -> str:
+        """
+        Stream a file to disk in chunks.
+        
+        Args:
+            session: HTTP session used for the download
+            semaphore: Semaphore limiting the number of concurrent downloads
+            url: URL of the file
+            file_path: Path to save the file to
+            
+        Returns:
+            MD5 hex digest of the file
+        """
+        digest = hashlib.md5()
+        async with semaphore:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                try:
+                    async with aiofiles.open(file_path, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                            digest.update(chunk)
+                            await f.write(chunk)
+                except BaseException:
+                    # Don't leave a partial file behind
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    raise
+        
+        return digest.hexdigest()
+    
+    def plan_download(self, attachment: Dict[str, Any], parent_item: Dict[str, Any], download_dir: str) -> Optional[str]:
+        """
+        Choose the file name of an attachment download with custom naming.
         
         Args:
             attachment: Attachment item data
             parent_item: Parent item data for naming
             download_dir: Directory to save files
             
+        Returns:
+            Path to save the file to, or None if it has already been downloaded
+        """
+        attachment_key = attachment['key']
+        original_filename = attachment['data'].get('filename', f"attachment_{attachment_key}")
+        
+        # Get parent item title for naming
+        parent_title = parent_item['data'].get('title', 'Untitled')
+        
+        # Sanitize the parent title for use as filename
+        base_filename = self.sanitize_filename(parent_title)
+        
+        # Get file extension from original filename
+        file_extension = self.get_file_extension(attachment)
+        
+        # Skip the download if the same file has already been downloaded
+        existing_filename = self.find_existing_download(
+            base_filename, file_extension, download_dir, attachment['data'].get('md5')
+        )
+        if existing_filename:
+            log.info("Already downloaded: %s (original: %s)", existing_filename, original_filename)
+            return None
+        
+        # Generate unique filename if needed
+        final_filename = self.generate_unique_filename(base_filename, file_extension, download_dir)
+        
+        return os.path.join(download_dir, final_filename)
+    
+    async def _download_one(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                            attachment: Dict[str, Any], file_path: str) -> bool:
+        """
+        Download a single attachment file.
+        
+        Args:
+            session: HTTP session used for the download
+            semaphore: Semaphore limiting the number of concurrent downloads
+            attachment: Attachment item data
+            file_path: Path to save the file to (see plan_download)
+            
         Returns:
             True if successful, False otherwise
         """
@@ -195,81 +741,221 @@ class ZoteroDownloader:
             attachment_key = attachment['key']
             original_filename = attachment['data'].get('filename', f"attachment_{attachment_key}")
             
-            # Get parent item title for naming
-            parent_title = parent_item['data'].get('title', 'Untitled')
-            
-            # Sanitize the parent title for use as filename
-            base_filename = self.sanitize_filename(parent_title)
-            
-            # Get file extension from original filename
-            file_extension = self.get_file_extension(attachment)
-            
-            # Create download directory if it doesn't exist
-            Path(download_dir).mkdir(parents=True, exist_ok=True)
-            
-            # Generate unique filename if needed
-            final_filename = self.generate_unique_filename(base_filename, file_extension, download_dir)
+            url = self.get_file_url(attachment_key)
+            md5 = await self._retry(lambda: self._stream_to_file(session, semaphore, url, file_path))
             
-            # Get the file content
-            file_content = self.zot.file(attachment_key)
+            # Remember the hash so later runs can skip this file without rehashing it
+            stat = os.stat(file_path)
+            self.cache.put_file_md5(os.path.abspath(file_path), stat.st_size, stat.st_mtime, md5)
             
-            # Save to file
-            file_path = os.path.join(download_dir, final_filename)
-            with open(file_path, 'wb') as f:
-                f.write(file_content)
-            
-            print(f"Downloaded: {final_filename} (original: {original_filename})")
+            log.info("Downloaded: %s (original: %s)", os.path.basename(file_path), original_filename)
             return True
             
         except Exception as e:
-            print(f"Error downloading attachment {attachment.get('key', 'unknown')}: {e}")
+            log.error("Error downloading attachment %s: %s", attachment.get('key', 'unknown'), e)
             return False
     
-    def download_recent_documents(self, days: int, download_dir: str = "zotero_downloads") -> None:
+    def _create_session(self) -> aiohttp.ClientSession:
         """
-        Main method to download all documents from recent items.
+        Create the HTTP session shared by all requests of a run.
+        
+        Its connection pool has room for every request the semaphores allow at
+        once and keeps idle connections open, so requests reuse connections
+        instead of doing a new TCP and TLS handshake each.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=MAX_CONCURRENT_DOWNLOADS + MAX_CONCURRENT_REQUESTS,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+        )
+        # aiohttp drops Authorization (unlike custom headers) when a file request
+        # redirects to the storage host, so the key isn't sent to third parties
+        headers = {'Authorization': f"Bearer {self.api_key}"}
+        return aiohttp.ClientSession(connector=connector, headers=headers, timeout=REQUEST_TIMEOUT)
+    
+    async def _download_all(self, session: aiohttp.ClientSession,
+                            attachments: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                            download_dir: str) -> Tuple[int, int]:
+        """
+        Download attachments concurrently.
         
         Args:
-            days: Number of days to look back
-            download_dir: Directory to save downloaded files
+            session: HTTP session used for the downloads
+            attachments: List of (attachment, parent item) pairs
+            download_dir: Directory to save files
+            
+        Returns:
+            Tuple of (successful downloads, attachments skipped as already downloaded)
         """
-        print(f"Fetching items added in the past {days} days...")
-        recent_items = self.get_recent_items(days)
+        # Resolve all file names up front, so the download tasks only do network I/O
+        successful_downloads = 0
+        skipped_downloads = 0
+        planned_downloads = []
+        for attachment, parent_item in attachments:
+            try:
+                file_path = self.plan_download(attachment, parent_item, download_dir)
+            except Exception as e:
+                log.error("Error downloading attachment %s: %s", attachment.get('key', 'unknown'), e)
+                continue
+            
+            if file_path is None:
+                skipped_downloads += 1
+            else:
+                planned_downloads.append((attachment, file_path))
         
-        if not recent_items:
-            print("No recent items found.")
-            return
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        tasks = [
+            self._download_one(session, semaphore, attachment, file_path)
+            for attachment, file_path in planned_downloads
+        ]
         
-        print(f"Found {len(recent_items)} recent items.")
+        for task in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Downloading"):
+            if await task:
+                successful_downloads += 1
         
-        total_downloads = 0
-        successful_downloads = 0
+        return successful_downloads, skipped_downloads
+    
+    async def _attachments_worker(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                  item_queue: asyncio.Queue, children: Dict[str, List[Dict[str, Any]]],
+                                  results: Dict[int, List[Dict[str, Any]]]) -> None:
+        """
+        Look up the attachments of queued (index, item) pairs until a None is queued.
         
-        for item in recent_items:
-            item_key = item['key']
-            title = item['data'].get('title', 'Untitled')
-            print(f"\nProcessing: {title}")
+        Args:
+            session: HTTP session used for the requests
+            semaphore: Semaphore limiting the number of concurrent requests
+            item_queue: Queue of (index, item) pairs
+            children: Child items from the listing, by parent key
+            results: Dict the attachments are stored in, by index
+        """
+        while True:
+            entry = await item_queue.get()
+            if entry is None:
+                return
+            index, item = entry
+            results[index] = await self.get_item_attachments(session, semaphore, item, children)
+    
+    async def _fetch_recent_attachments(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                        days: int) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Get items added in the past n days together with their attachments.
+        
+        Attachment lookups start while later pages of the listing are still
+        being fetched.
+        
+        Args:
+            session: HTTP session used for the requests
+            semaphore: Semaphore limiting the number of concurrent requests
+            days: Number of days to look back
+            
+        Returns:
+            List of (parent item, attachments) pairs, newest first
+        """
+        children = {}
+        item_queue = asyncio.Queue(maxsize=ITEMS_QUEUE_SIZE)
+        results = {}
+        workers = [
+            asyncio.ensure_future(self._attachments_worker(session, semaphore, item_queue, children, results))
+            for _ in range(MAX_CONCURRENT_REQUESTS)
+        ]
+        
+        recent_items = []
+        try:
+            async for item in self.get_recent_items(session, semaphore, days, children):
+                # Items without children (per the listing's meta) have nothing to look up
+                if item.get('meta', {}).get('numChildren') == 0:
+                    results[len(recent_items)] = []
+                else:
+                    await item_queue.put((len(recent_items), item))
+                recent_items.append(item)
+        finally:
+            for _ in workers:
+                await item_queue.put(None)
+            await asyncio.gather(*workers)
+        
+        return [(item, results[index]) for index, item in enumerate(recent_items)]
+    
+    async def _download_items(self, session: aiohttp.ClientSession,
+                              items: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+                              download_dir: str) -> Tuple[int, int, int]:
+        """
+        Download the attachments of the given items.
+        
+        Args:
+            session: HTTP session used for the downloads
+            items: List of (parent item, attachments) pairs
+            download_dir: Directory to save downloaded files
             
-            # Get attachments for this item
-            attachments = self.get_item_attachments(item_key)
+        Returns:
+            Tuple of (total attachments found, successful downloads, already downloaded attachments)
+        """
+        pending_downloads = []
+        for item, attachments in items:
+            title = item['data'].get('title', 'Untitled')
+            log.info("Processing: %s", title)
             
             if not attachments:
-                print(f"  No file attachments found.")
+                log.info("  No file attachments found.")
                 continue
             
-            print(f"  Found {len(attachments)} attachment(s)")
+            log.info("  Found %d attachment(s)", len(attachments))
             
-            # Download each attachment
-            for attachment in attachments:
-                total_downloads += 1
-                if self.download_attachment(attachment, item, download_dir):
-                    successful_downloads += 1
+            pending_downloads.extend((attachment, item) for attachment in attachments)
         
-        print(f"\n=== Download Summary ===")
-        print(f"Total attachments found: {total_downloads}")
-        print(f"Successfully downloaded: {successful_downloads}")
-        print(f"Failed downloads: {total_downloads - successful_downloads}")
-        print(f"Files saved to: {os.path.abspath(download_dir)}")
+        # Create download directory if it doesn't exist
+        if pending_downloads:
+            Path(download_dir).mkdir(parents=True, exist_ok=True)
+        
+        # Download all attachments concurrently
+        successful_downloads, skipped_downloads = await self._download_all(
+            session, pending_downloads, download_dir
+        )
+        
+        return len(pending_downloads), successful_downloads, skipped_downloads
+    
+    async def _download_recent_documents(self, days: int, download_dir: str) -> None:
+        """
+        Download all documents from recent items (see download_recent_documents).
+        """
+        # The library may have changed since the last run, so revalidate the first request
+        self.library_version = None
+        
+        async with self._create_session() as session:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            
+            log.info("Fetching items added in the past %s days...", days)
+            recent_items = await self._fetch_recent_attachments(session, semaphore, days)
+            
+            if not recent_items:
+                log.info("No recent items found.")
+                return
+            
+            log.info("Found %d recent items.", len(recent_items))
+            
+            total_downloads, successful_downloads, skipped_downloads = await self._download_items(
+                session, recent_items, download_dir
+            )
+        
+        log.info("=== Download Summary ===")
+        log.info("Total attachments found: %d", total_downloads)
+        log.info("Successfully downloaded: %d", successful_downloads)
+        log.info("Already downloaded: %d", skipped_downloads)
+        log.info("Failed downloads: %d", total_downloads - successful_downloads - skipped_downloads)
+        log.info("Files saved to: %s", os.path.abspath(download_dir))
+    
+    def download_recent_documents(self, days: int, download_dir: str = "zotero_downloads") -> None:
+        """
+        Main method to download all documents from recent items.
+        
+        Args:
+            days: Number of days to look back
+            download_dir: Directory to save downloaded files
+        """
+        with queued_logging():
+            try:
+                asyncio.run(self._download_recent_documents(days, download_dir))
+            finally:
+                self.cache.save()
 
 
 def main():
@@ -282,9 +968,9 @@ def main():
     # Number of days to look back
     DAYS_BACK = int(input("Enter DAYS_BACK: "))
     
-    # Download directory
+    # Download directory (a fixed one can be set in the .env file to skip files downloaded earlier)
     current_timestamp = datetime.now().strftime("%Y-%m-%d-%H%M")
-    DOWNLOAD_DIR = "zotero_recent_downloads_" + current_timestamp
+    DOWNLOAD_DIR = os.getenv('ZOTERO_DOWNLOAD_DIR') or "zotero_recent_downloads_" + current_timestamp
     
     # Validate configuration
     if not USER_ID or not API_KEY:
@@ -295,16 +981,17 @@ def main():
         print("3. Your user ID is shown on the same page")
         sys.exit(1)
     
-    try:
-        # Create downloader instance
-        downloader = ZoteroDownloader(USER_ID, API_KEY)
-        
-        # Download recent documents
-        downloader.download_recent_documents(DAYS_BACK, DOWNLOAD_DIR)
-        
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+    with queued_logging():
+        try:
+            # Create downloader instance
+            downloader = ZoteroDownloader(USER_ID, API_KEY)
+            
+            # Download recent documents
+            downloader.download_recent_documents(DAYS_BACK, DOWNLOAD_DIR)
+            
+        except Exception as e:
+            log.error("Error: %s", e)
+            sys.exit(1)
 
 
 if __name__ == "__main__":